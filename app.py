@@ -4,11 +4,13 @@ Application Flask pour générer des newsletters HTML depuis des fichiers Excel
 from flask import Flask, render_template, request, send_file, jsonify, redirect, url_for
 from werkzeug.utils import secure_filename
 import os
+import uuid
 import zipfile
 from io import BytesIO
 from datetime import datetime
-from excel_parser import NewsletterExcelParser
+from excel_parser import NewsletterExcelParser, NewsletterValidationError
 from html_generator import NewsletterHTMLGenerator
+from campaign_publisher import PublishingQueue
 from auth import requires_auth
 
 # Configuration de l'application
@@ -27,17 +29,83 @@ ALLOWED_EXTENSIONS = {'xls', 'xlsx'}
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
 
+# Générateur partagé par l'aperçu en direct (template compilé une seule fois,
+# puis recompilé si la feuille de styles ou les templates changent)
+_preview_generator = None
+
+# Publications vers l'ESP, exécutées en arrière-plan
+publishing_queue = PublishingQueue()
+
 
 def allowed_file(filename):
     """Vérifie si le fichier a une extension autorisée."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def publishing_enabled():
+    """Vérifie si l'API de l'ESP est configurée."""
+    return bool(os.environ.get('ESP_API_URL'))
+
+
+def load_edition(filename, subject):
+    """
+    Charge une newsletter générée (HTML et version texte) pour la publier.
+
+    Args:
+        filename: Nom du fichier HTML dans le dossier de sortie
+        subject: Objet de la campagne
+
+    Returns:
+        Dictionnaire {name, subject, html, text}
+    """
+    html_path = os.path.join(app.config['OUTPUT_FOLDER'], secure_filename(filename))
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+
+    text_content = ''
+    text_path = os.path.splitext(html_path)[0] + '.txt'
+    if os.path.exists(text_path):
+        with open(text_path, 'r', encoding='utf-8') as f:
+            text_content = f.read()
+
+    return {
+        'name': os.path.splitext(os.path.basename(html_path))[0],
+        'subject': subject,
+        'html': html_content,
+        'text': text_content
+    }
+
+
+def new_edition_name():
+    """
+    Retourne un nom d'édition unique (sans extension).
+
+    Le suffixe aléatoire évite qu'une sauvegarde ou un upload dans la même
+    seconde écrase l'édition précédente.
+    """
+    return f"newsletter_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+def get_preview_generator():
+    """
+    Retourne le générateur partagé, créé au premier appel.
+
+    Il est recréé quand static/email-styles.css ou les templates sont
+    modifiés, pour que l'aperçu reste identique aux éditions générées par
+    /upload (qui crée un générateur à chaque requête).
+    """
+    global _preview_generator
+    generator = _preview_generator
+    if generator is None or generator.current_sources_mtime() != generator.sources_mtime:
+        generator = _preview_generator = NewsletterHTMLGenerator()
+    return generator
+
+
 @app.route('/')
 @requires_auth
 def index():
     """Page d'accueil avec le formulaire d'upload."""
-    return render_template('index.html')
+    return render_template('index.html', publishing_enabled=publishing_enabled())
 
 
 @app.route('/upload', methods=['POST'])
@@ -72,7 +140,7 @@ def upload_file():
         upload_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{timestamp}_{filename}")
         file.save(upload_path)
 
-        # Parser le fichier Excel
+        # Valider puis parser le fichier Excel (l'en-tête est vérifié avant de charger les lignes)
         parser = NewsletterExcelParser(upload_path)
         resources = parser.parse()
 
@@ -81,7 +149,8 @@ def upload_file():
 
         # Générer le HTML
         generator = NewsletterHTMLGenerator()
-        output_filename = f"newsletter_{timestamp}.html"
+        edition_name = new_edition_name()
+        output_filename = f"{edition_name}.html"
         output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
 
         html_content = generator.generate(
@@ -89,22 +158,158 @@ def upload_file():
             newsletter_date=newsletter_date,
             output_path=output_path
         )
+        text_content = generator.generate_text(
+            resources=resources,
+            newsletter_date=newsletter_date,
+            output_path=os.path.splitext(output_path)[0] + '.txt'
+        )
 
         # Générer les statistiques
         stats = generator.generate_stats(resources)
 
-        # Retourner les informations
-        return jsonify({
+        response = {
             'success': True,
             'message': 'Newsletter générée avec succès!',
             'output_file': output_filename,
             'stats': stats,
-            'download_url': url_for('download_file', filename=output_filename)
+            'resources': resources,
+            'newsletter_date': newsletter_date,
+            'download_url': url_for('download_file', filename=output_filename),
+            'validation_warnings': parser.warnings
+        }
+
+        # Publication optionnelle sur l'ESP, sans attendre la réponse de l'API
+        if request.form.get('publish') == 'true' and publishing_enabled():
+            job_id = publishing_queue.submit([{
+                'name': edition_name,
+                'subject': f"UX Curation - {newsletter_date}",
+                'html': html_content,
+                'text': text_content
+            }])
+            response['publish_status_url'] = url_for('publish_status', job_id=job_id)
+
+        # Retourner les informations
+        return jsonify(response)
+
+    except NewsletterValidationError as e:
+        # Rapport détaillé par ligne pour corriger le fichier Excel
+        return jsonify({'error': str(e), 'validation_errors': e.errors}), 400
+    except Exception as e:
+        return jsonify({'error': f'Erreur lors de la génération: {str(e)}'}), 500
+
+
+@app.route('/render', methods=['POST'])
+@requires_auth
+def render_newsletter():
+    """
+    Génère le HTML de la newsletter depuis des ressources JSON, sans fichier Excel.
+
+    Corps attendu : {"resources": [...], "newsletter_date": "...", "section": "...", "save": true}
+    où resources a la même structure que celle produite par NewsletterExcelParser.
+    Si section est fournie (ex: "ressources"), seul le fragment HTML de cette
+    section est retourné (utilisé par l'aperçu en direct).
+    Si save est vrai, la newsletter complète (HTML + texte) est enregistrée dans
+    OUTPUT_FOLDER comme une nouvelle édition, et la réponse JSON contient son
+    nom et ses URLs de téléchargement et d'aperçu.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get('resources'), list):
+        return jsonify({'error': "Corps JSON invalide : une liste 'resources' est attendue"}), 400
+
+    try:
+        resources = NewsletterExcelParser.parse_records(payload['resources'])
+    except NewsletterValidationError as e:
+        return jsonify({'error': str(e), 'validation_errors': e.errors}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not resources:
+        return jsonify({'error': 'Aucune ressource fournie'}), 400
+
+    newsletter_date = payload.get('newsletter_date') or datetime.now().strftime("%B %Y")
+    section = payload.get('section')
+    if section is not None and not isinstance(section, str):
+        return jsonify({'error': "Corps JSON invalide : 'section' doit être une chaîne"}), 400
+    generator = get_preview_generator()
+
+    if payload.get('save') is True:
+        if section:
+            return jsonify({'error': "Une section ne peut pas être enregistrée seule"}), 400
+        output_filename = f"{new_edition_name()}.html"
+        output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+        try:
+            generator.generate(resources=resources, newsletter_date=newsletter_date, output_path=output_path)
+            generator.generate_text(
+                resources=resources,
+                newsletter_date=newsletter_date,
+                output_path=os.path.splitext(output_path)[0] + '.txt'
+            )
+        except Exception as e:
+            return jsonify({'error': f'Erreur lors de la génération: {str(e)}'}), 500
+
+        return jsonify({
+            'success': True,
+            'output_file': output_filename,
+            'newsletter_date': newsletter_date,
+            'download_url': url_for('download_file', filename=output_filename),
+            'preview_url': url_for('preview_file', filename=output_filename)
         })
 
+    try:
+        if section:
+            if section not in generator.SECTION_BLOCKS:
+                return jsonify({'error': f'Section inconnue : {section}'}), 400
+            html_content = generator.render_section(resources, section, newsletter_date)
+        else:
+            html_content = generator.generate(resources=resources, newsletter_date=newsletter_date)
     except Exception as e:
         return jsonify({'error': f'Erreur lors de la génération: {str(e)}'}), 500
 
+    return html_content
+
+
+@app.route('/publish', methods=['POST'])
+@requires_auth
+def publish():
+    """
+    Publie une ou plusieurs newsletters générées sur l'ESP, en arrière-plan.
+
+    Corps attendu : {"files": ["newsletter_....html", ...], "subject": "..."}
+    La réponse (202) contient l'URL pour suivre la publication.
+    """
+    if not publishing_enabled():
+        return jsonify({'error': "Publication non configurée (variable ESP_API_URL)"}), 400
+
+    payload = request.get_json(silent=True) or {}
+    files = payload.get('files')
+    if not isinstance(files, list) or not files:
+        return jsonify({'error': "Corps JSON invalide : une liste 'files' est attendue"}), 400
+    if not all(isinstance(filename, str) and filename.endswith('.html') for filename in files):
+        return jsonify({'error': "Corps JSON invalide : 'files' doit contenir des noms de fichiers .html"}), 400
+
+    subject = payload.get('subject') or 'UX Curation Newsletter'
+    try:
+        editions = [load_edition(filename, subject) for filename in files]
+    except FileNotFoundError:
+        return jsonify({'error': 'Fichier introuvable'}), 404
+
+    job_id = publishing_queue.submit(editions)
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': url_for('publish_status', job_id=job_id)
+    }), 202
+
+
+@app.route('/publish/<job_id>')
+@requires_auth
+def publish_status(job_id):
+    """Retourne le statut d'une publication."""
+    job = publishing_queue.status(job_id)
+    if job is None:
+        return jsonify({'error': 'Publication introuvable'}), 404
+    return jsonify(job)
+
 
 @app.route('/download/<filename>')
 def download_file(filename):
@@ -120,6 +325,11 @@ def download_file(filename):
             # Ajouter le fichier HTML au ZIP avec un nom propre
             zf.write(file_path, arcname=filename)
 
+            # Ajouter la version texte si elle existe
+            text_path = os.path.splitext(file_path)[0] + '.txt'
+            if os.path.exists(text_path):
+                zf.write(text_path, arcname=os.path.basename(text_path))
+
         # Repositionner le curseur au début du fichier
         memory_file.seek(0)
 
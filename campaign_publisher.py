@@ -0,0 +1,301 @@
+"""
+Module pour publier les newsletters générées sur l'API de campagnes d'un ESP
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any
+import hashlib
+import os
+import threading
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class CampaignPublisher:
+    """
+    Publie des éditions (HTML + texte) sur l'API de campagnes d'un ESP.
+
+    L'API attendue reçoit POST {api_url}/campaigns avec un corps JSON
+    {name, subject, html, text}, une authentification Bearer et un en-tête
+    Idempotency-Key (voir mock_esp_server.py pour une implémentation locale).
+
+    Les connexions HTTP sont réutilisées (keep-alive) via un pool partagé,
+    dimensionné sur le nombre maximal de publications simultanées. Les erreurs
+    temporaires (429, 5xx, coupures réseau) sont retentées avec un délai
+    croissant ; la clé d'idempotence, calculée à partir du contenu, garantit
+    qu'une édition retentée ou republiée ne crée pas de doublon.
+    """
+
+    # Codes HTTP considérés comme temporaires
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        api_url: str = None,
+        api_key: str = None,
+        max_concurrency: int = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: float = 10
+    ):
+        """
+        Initialise le client HTTP de l'ESP.
+
+        Args:
+            api_url: URL de base de l'API (défaut : variable ESP_API_URL)
+            api_key: Clé d'API (défaut : variable ESP_API_KEY)
+            max_concurrency: Publications simultanées (défaut : ESP_MAX_CONCURRENCY ou 4)
+            max_retries: Nombre de nouvelles tentatives par requête
+            backoff_factor: Base du délai entre tentatives (0.5s, 1s, 2s...)
+            timeout: Délai maximal d'une requête, en secondes
+        """
+        self.api_url = (api_url or os.environ.get('ESP_API_URL', '')).rstrip('/')
+        self.api_key = api_key or os.environ.get('ESP_API_KEY', '')
+        self.max_concurrency = max_concurrency or int(os.environ.get('ESP_MAX_CONCURRENCY', 4))
+        self.timeout = timeout
+
+        if not self.api_url:
+            raise ValueError("ESP non configuré : définissez la variable d'environnement ESP_API_URL")
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=None,  # POST inclus : les requêtes sont idempotentes
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_concurrency,
+            pool_block=True,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Authorization': f"Bearer {self.api_key}",
+            'Content-Type': 'application/json'
+        })
+
+    @staticmethod
+    def idempotency_key(edition: Dict[str, Any]) -> str:
+        """
+        Calcule la clé d'idempotence d'une édition à partir de tout ce qui est envoyé.
+
+        Le nom et l'objet font partie de l'empreinte : une même édition republiée
+        avec un autre objet crée une nouvelle campagne au lieu d'être ignorée.
+
+        Args:
+            edition: Dictionnaire {name, subject, html, text}
+
+        Returns:
+            Empreinte SHA-256 du nom, de l'objet, du HTML et du texte
+        """
+        digest = hashlib.sha256()
+        for field in ('name', 'subject', 'html', 'text'):
+            digest.update((edition.get(field) or '').encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def publish(self, edition: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Publie une édition sous forme de campagne.
+
+        Args:
+            edition: Dictionnaire {name, subject, html, text}
+
+        Returns:
+            Résultat {name, idempotency_key, success, campaign_id | error}
+        """
+        key = self.idempotency_key(edition)
+        result = {'name': edition.get('name', ''), 'idempotency_key': key}
+
+        try:
+            response = self.session.post(
+                f"{self.api_url}/campaigns",
+                json={
+                    'name': edition.get('name', ''),
+                    'subject': edition['subject'],
+                    'html': edition['html'],
+                    'text': edition.get('text', '')
+                },
+                headers={'Idempotency-Key': key},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            result.update({'success': True, 'campaign_id': response.json().get('id')})
+        except requests.RequestException as e:
+            result.update({'success': False, 'error': str(e)})
+
+        return result
+
+    def publish_many(self, editions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Publie plusieurs éditions en parallèle (au plus max_concurrency à la fois).
+
+        Une erreur sur une édition n'interrompt pas les autres.
+
+        Args:
+            editions: Liste de dictionnaires {name, subject, html, text}
+
+        Returns:
+            Résultats dans le même ordre que les éditions
+        """
+        if len(editions) <= 1:
+            return [self.publish(edition) for edition in editions]
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(self.publish, editions))
+
+    def close(self) -> None:
+        """Ferme les connexions du pool."""
+        self.session.close()
+
+
+class PublishingQueue:
+    """
+    Exécute les publications en arrière-plan et conserve leur statut.
+
+    Les requêtes web déposent un job et répondent immédiatement ; le statut est
+    ensuite consultable via son identifiant. Les statuts sont conservés en
+    mémoire, par processus.
+    """
+
+    # Nombre de jobs terminés conservés en mémoire
+    MAX_FINISHED_JOBS = 100
+
+    def __init__(self, publisher_factory=CampaignPublisher):
+        """
+        Args:
+            publisher_factory: Fonction créant le CampaignPublisher (appelée au premier job)
+        """
+        self.publisher_factory = publisher_factory
+        self.publisher = None
+        self.jobs = {}
+        self.lock = threading.Lock()
+        # Un seul job à la fois : la concurrence est gérée par le publisher
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='publisher')
+
+    def submit(self, editions: List[Dict[str, Any]]) -> str:
+        """
+        Dépose un job de publication.
+
+        Args:
+            editions: Liste de dictionnaires {name, subject, html, text}
+
+        Returns:
+            Identifiant du job
+        """
+        job_id = uuid.uuid4().hex
+        with self.lock:
+            self._forget_finished_jobs()
+            self.jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'pending',
+                'editions': [edition.get('name', '') for edition in editions],
+                'created': datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+                'results': []
+            }
+        self.executor.submit(self._run, job_id, editions)
+        return job_id
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        """Retourne une copie du statut d'un job, ou None s'il est inconnu."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _run(self, job_id: str, editions: List[Dict[str, Any]]) -> None:
+        """Publie les éditions d'un job (exécuté dans le thread d'arrière-plan)."""
+        self._update(job_id, status='running')
+        try:
+            if self.publisher is None:
+                self.publisher = self.publisher_factory()
+            results = self.publisher.publish_many(editions)
+            failed = any(not result['success'] for result in results)
+            self._update(job_id, status='failed' if failed else 'done', results=results)
+        except Exception as e:
+            self._update(job_id, status='failed', error=str(e))
+
+    def _update(self, job_id: str, **changes) -> None:
+        """Met à jour le statut d'un job."""
+        with self.lock:
+            self.jobs[job_id].update(changes)
+
+    def _forget_finished_jobs(self) -> None:
+        """Oublie les jobs terminés les plus anciens au-delà de MAX_FINISHED_JOBS."""
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] in ('done', 'failed')]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+
+def test_publisher():
+    """
+    Fonction de test : publie l'exemple sur le serveur ESP factice.
+    """
+    import time
+    from excel_parser import NewsletterExcelParser
+    from html_generator import NewsletterHTMLGenerator
+    from mock_esp_server import start_mock_server
+
+    # Générer plusieurs éditions à partir de l'exemple
+    resources = NewsletterExcelParser('examples/exemple.xlsx').parse()
+    generator = NewsletterHTMLGenerator()
+    editions = [
+        {
+            'name': f"newsletter_{month}",
+            'subject': f"UX Curation - {month}",
+            'html': generator.generate(resources=resources, newsletter_date=month),
+            'text': generator.generate_text(resources=resources, newsletter_date=month)
+        }
+        for month in ['Janvier 2025', 'Février 2025', 'Mars 2025', 'Avril 2025', 'Mai 2025', 'Juin 2025']
+    ]
+
+    # Les 2 premières requêtes échouent en 503 pour vérifier les retries
+    server = start_mock_server(fail_next=2)
+    publisher = CampaignPublisher(
+        api_url=server.url, api_key='mock-key', max_concurrency=3, backoff_factor=0.01
+    )
+
+    start = time.perf_counter()
+    results = publisher.publish_many(editions)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert all(result['success'] for result in results), results
+    assert len(server.campaigns) == len(editions)
+
+    # Republier les mêmes éditions ne crée pas de doublons
+    again = publisher.publish_many(editions)
+    assert [r['campaign_id'] for r in again] == [r['campaign_id'] for r in results]
+    assert len(server.campaigns) == len(editions)
+
+    # Changer l'objet crée une nouvelle campagne
+    renamed = publisher.publish(dict(editions[0], subject="Autre sujet"))
+    assert renamed['success'] and renamed['campaign_id'] != results[0]['campaign_id']
+    assert len(server.campaigns) == len(editions) + 1
+    assert server.connection_count <= publisher.max_concurrency
+
+    # Publication en arrière-plan
+    queue = PublishingQueue(lambda: publisher)
+    job_id = queue.submit(editions[:1])
+    while queue.status(job_id)['status'] in ('pending', 'running'):
+        time.sleep(0.01)
+    assert queue.status(job_id)['status'] == 'done'
+
+    print(f"\n📤 {len(editions)} éditions publiées en {elapsed_ms:.0f} ms")
+    print(f"  Requêtes reçues (retries compris): {server.request_count}")
+    print(f"  Connexions ouvertes: {server.connection_count}")
+    print(f"  Campagnes créées: {len(server.campaigns)}")
+    print(f"\n✅ Test réussi !")
+
+    publisher.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    test_publisher()
@@ -0,0 +1,643 @@
+"""
+Module pour inliner la feuille de styles de la newsletter dans le HTML généré
+"""
+from functools import lru_cache
+from html import escape
+from jinja2 import BaseLoader
+from typing import Dict, List, Optional, Tuple
+import os
+import re
+import threading
+
+
+# Éléments HTML sans balise fermante (ne sont jamais empilés)
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+# Éléments dont le contenu est du texte brut à ne pas analyser
+RAW_TEXT_ELEMENTS = {'style', 'script'}
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_RULE_RE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+_VAR_RE = re.compile(r'var\(\s*(--[\w-]+)\s*(?:,\s*([^)]*))?\)')
+_COMPOUND_RE = re.compile(r'^([a-zA-Z][\w-]*|\*)?((?:[.#][\w-]+)*)$')
+_SIMPLE_RE = re.compile(r'([.#])([\w-]+)')
+
+# Tokenizer HTML : commentaires, balises ouvrantes et fermantes.
+# [^>]* suppose qu'aucun '>' n'apparaît dans une balise : vrai pour du HTML
+# rendu (Jinja2 échappe les valeurs), pas pour la source d'un template, où
+# les balises Jinja2 sont masquées avant l'inlining (voir inline_template).
+_TAG_RE = re.compile(r'<!--.*?-->|<(/?)([a-zA-Z][a-zA-Z0-9]*)([^>]*)>', re.S)
+_ATTR_RE = re.compile(r'([^\s=/]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+_STYLE_ATTR_RE = re.compile(r'(\sstyle\s*=\s*)("([^"]*)"|\'([^\']*)\')', re.I)
+_CLASS_ATTR_RE = re.compile(r'\sclass\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+)', re.I)
+_CLASS_NAME_RE = re.compile(r'\.(-?[a-zA-Z_][\w-]*)')
+
+# Balises Jinja2 ({{ ... }}, {% ... %}, {# ... #}) et leur marqueur de masquage
+_JINJA_RE = re.compile(r'\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\}', re.S)
+_JINJA_MARKER = '\x00'
+_JINJA_PLACEHOLDER_RE = re.compile(r'\x00(\d+)\x00')
+
+# Signature d'un élément : (balise, id, classes)
+Element = Tuple[str, Optional[str], frozenset]
+
+
+class Selector:
+    """
+    Sélecteur CSS compilé (balise, classes, id, combinateurs descendant et enfant).
+
+    Les composants sont stockés de droite à gauche pour que la correspondance
+    commence par l'élément courant, comme dans les moteurs des navigateurs.
+    """
+
+    def __init__(self, parts: List[Tuple[str, Optional[str], Optional[str], frozenset]]):
+        """
+        Args:
+            parts: Liste de (combinateur, balise, id, classes), de droite à gauche
+        """
+        self.parts = parts
+        ids = sum(1 for _, _, id_, _ in parts if id_)
+        classes = sum(len(cls) for _, _, _, cls in parts)
+        tags = sum(1 for _, tag, _, _ in parts if tag)
+        self.specificity = (ids, classes, tags)
+
+    def matches(self, chain: Tuple[Element, ...]) -> bool:
+        """
+        Indique si le dernier élément de la chaîne d'ancêtres correspond au sélecteur.
+
+        Args:
+            chain: Signatures des éléments ouverts, de la racine à l'élément courant
+
+        Returns:
+            True si le sélecteur s'applique à l'élément courant
+        """
+        return self._match_from(chain, len(chain) - 1, 0)
+
+    def _match_from(self, chain: Tuple[Element, ...], position: int, part_index: int) -> bool:
+        """Correspondance récursive avec retour arrière pour le combinateur descendant."""
+        if not self._match_compound(chain[position], self.parts[part_index]):
+            return False
+        if part_index == len(self.parts) - 1:
+            return True
+
+        combinator = self.parts[part_index][0]
+        if combinator == '>':
+            return position > 0 and self._match_from(chain, position - 1, part_index + 1)
+
+        for ancestor in range(position - 1, -1, -1):
+            if self._match_from(chain, ancestor, part_index + 1):
+                return True
+        return False
+
+    @staticmethod
+    def _match_compound(element: Element, part) -> bool:
+        """Vérifie un sélecteur simple composé (ex: td.event-cell) sur un élément."""
+        tag, element_id, element_classes = element
+        _, part_tag, part_id, part_classes = part
+        if part_tag and part_tag != tag:
+            return False
+        if part_id and part_id != element_id:
+            return False
+        return part_classes <= element_classes
+
+
+class Stylesheet:
+    """
+    Feuille de styles parsée et compilée une seule fois par processus.
+
+    Sépare les règles inlinables (sélecteurs simples) de celles qui doivent
+    rester dans un bloc <style> (media queries, pseudo-classes...).
+    """
+
+    def __init__(self, css: str):
+        """
+        Args:
+            css: Contenu brut de la feuille de styles
+        """
+        self.leftover_css = ''    # Règles à conserver dans <style>
+        self.leftover_classes = frozenset()  # Classes encore utilisées par leftover_css
+        self._index = {}          # Clé du composant le plus à droite -> [(Selector, ordre, déclarations)]
+
+        # Arbre des chemins d'ancêtres déjà rencontrés : chaque nœud identifie
+        # une chaîne (racine -> élément) et mémorise le style calculé pour elle
+        self._nodes = {}          # (nœud parent, signature) -> nœud
+        self._node_chains = [()]  # nœud -> chaîne d'ancêtres (0 = racine)
+        self._node_styles = ['']  # nœud -> attribut style calculé
+        self._nodes_lock = threading.Lock()  # La feuille est partagée entre threads
+
+        css = _COMMENT_RE.sub('', css)
+        css, at_rules = self._extract_at_rules(css)
+        variables = self._extract_variables(css)
+
+        leftover = []
+        order = 0
+        for match in _RULE_RE.finditer(css):
+            selectors_text = match.group(1).strip()
+            body = match.group(2).strip()
+            if selectors_text == ':root':
+                continue
+
+            declarations = self._parse_declarations(body, variables)
+            for selector_text in selectors_text.split(','):
+                selector_text = selector_text.strip()
+                selector = self._compile_selector(selector_text)
+                if selector is None:
+                    leftover.append(f"{selector_text} {{ {self._format(declarations)} }}")
+                    continue
+                self._index.setdefault(self._index_key(selector), []).append(
+                    (selector, order, declarations)
+                )
+                order += 1
+
+        for at_rule in at_rules:
+            leftover.append(_VAR_RE.sub(lambda m: self._resolve_var(m, variables), at_rule))
+
+        self.leftover_css = '\n'.join(leftover)
+        self.leftover_classes = frozenset(_CLASS_NAME_RE.findall(self.leftover_css))
+
+    def child_node(self, parent: int, element: Element) -> int:
+        """
+        Retourne le nœud correspondant à `element` ouvert sous `parent`.
+
+        Les sélecteurs ne sont évalués qu'à la création d'un nœud : les éditions
+        répètent les mêmes structures, donc chaque chaîne d'ancêtres n'est
+        calculée qu'une seule fois par processus.
+
+        Args:
+            parent: Nœud de l'élément parent (0 pour la racine)
+            element: Signature (balise, id, classes) de l'élément
+
+        Returns:
+            Identifiant du nœud, à passer à style_of()
+        """
+        key = (parent, element)
+        node = self._nodes.get(key)
+        if node is not None:
+            return node
+
+        with self._nodes_lock:
+            # Un autre thread a pu créer le nœud entre-temps
+            node = self._nodes.get(key)
+            if node is None:
+                chain = self._node_chains[parent] + (element,)
+                self._node_styles.append(self._compute_style(chain))
+                self._node_chains.append(chain)
+                node = len(self._node_chains) - 1
+                self._nodes[key] = node
+        return node
+
+    def style_of(self, node: int) -> str:
+        """Retourne l'attribut style (déjà échappé) calculé pour un nœud."""
+        return self._node_styles[node]
+
+    def _compute_style(self, chain: Tuple[Element, ...]) -> str:
+        """
+        Calcule les déclarations applicables au dernier élément de la chaîne.
+
+        Args:
+            chain: Signatures des éléments ouverts, de la racine à l'élément courant
+
+        Returns:
+            Le contenu de l'attribut style, ou une chaîne vide
+        """
+        tag, element_id, element_classes = chain[-1]
+        candidates = list(self._index.get(('tag', tag), []))
+        candidates += self._index.get(('*', None), [])
+        if element_id:
+            candidates += self._index.get(('id', element_id), [])
+        for class_name in element_classes:
+            candidates += self._index.get(('class', class_name), [])
+
+        matched = [rule for rule in candidates if rule[0].matches(chain)]
+        matched.sort(key=lambda rule: (rule[0].specificity, rule[1]))
+
+        if not matched:
+            return ''
+
+        style = {}
+        for _, _, declarations in matched:
+            for prop, value in declarations:
+                style[prop] = value
+        return escape(self._format(style), quote=True)
+
+    @staticmethod
+    def _extract_at_rules(css: str) -> Tuple[str, List[str]]:
+        """Retire les blocs @media/@font-face (accolades imbriquées) du CSS."""
+        at_rules = []
+        remaining = []
+        position = 0
+        while True:
+            start = css.find('@', position)
+            if start == -1:
+                remaining.append(css[position:])
+                break
+            remaining.append(css[position:start])
+            brace = css.find('{', start)
+            if brace == -1:
+                break
+            depth = 0
+            end = brace
+            while end < len(css):
+                if css[end] == '{':
+                    depth += 1
+                elif css[end] == '}':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                end += 1
+            at_rules.append(css[start:end + 1].strip())
+            position = end + 1
+        return ''.join(remaining), at_rules
+
+    @staticmethod
+    def _extract_variables(css: str) -> Dict[str, str]:
+        """Récupère les propriétés personnalisées déclarées dans :root."""
+        variables = {}
+        for match in _RULE_RE.finditer(css):
+            if match.group(1).strip() == ':root':
+                for declaration in match.group(2).split(';'):
+                    if ':' in declaration:
+                        name, value = declaration.split(':', 1)
+                        variables[name.strip()] = value.strip()
+        return variables
+
+    @classmethod
+    def _parse_declarations(cls, body: str, variables: Dict[str, str]) -> List[Tuple[str, str]]:
+        """Découpe un bloc de déclarations en paires (propriété, valeur)."""
+        declarations = []
+        for declaration in body.split(';'):
+            if ':' not in declaration:
+                continue
+            prop, value = declaration.split(':', 1)
+            value = _VAR_RE.sub(lambda m: cls._resolve_var(m, variables), value.strip())
+            declarations.append((prop.strip().lower(), value))
+        return declarations
+
+    @staticmethod
+    def _resolve_var(match, variables: Dict[str, str]) -> str:
+        """Remplace var(--nom) par sa valeur : les clients email ne les supportent pas."""
+        name, fallback = match.group(1), match.group(2)
+        return variables.get(name, (fallback or '').strip())
+
+    @staticmethod
+    def _compile_selector(text: str) -> Optional[Selector]:
+        """
+        Compile un sélecteur, ou retourne None s'il ne peut pas être inliné
+        (pseudo-classes, attributs, combinateurs + et ~).
+        """
+        tokens = text.replace('>', ' > ').split()
+        parts = []
+        combinator = ' '
+        for token in reversed(tokens):
+            if token == '>':
+                if not parts or combinator == '>':
+                    return None
+                combinator = '>'
+                continue
+            match = _COMPOUND_RE.match(token)
+            if not match:
+                return None
+            tag = match.group(1) if match.group(1) != '*' else None
+            element_id = None
+            classes = set()
+            for kind, name in _SIMPLE_RE.findall(match.group(2)):
+                if kind == '#':
+                    element_id = name
+                else:
+                    classes.add(name)
+            if parts:
+                # Le combinateur relie ce composant au composant précédent (à droite)
+                prev = parts[-1]
+                parts[-1] = (combinator, prev[1], prev[2], prev[3])
+            parts.append((' ', tag.lower() if tag else None, element_id, frozenset(classes)))
+            combinator = ' '
+        if not parts or combinator == '>':
+            return None
+        return Selector(parts)
+
+    @staticmethod
+    def _index_key(selector: Selector) -> Tuple[str, Optional[str]]:
+        """Clé d'indexation basée sur le composant le plus sélectif à droite."""
+        _, tag, element_id, classes = selector.parts[0]
+        if element_id:
+            return ('id', element_id)
+        if classes:
+            return ('class', min(classes))
+        if tag:
+            return ('tag', tag)
+        return ('*', None)
+
+    @staticmethod
+    def _format(declarations) -> str:
+        """Sérialise des déclarations au format d'un attribut style."""
+        items = declarations.items() if isinstance(declarations, dict) else declarations
+        return '; '.join(f"{prop}: {value}" for prop, value in items) + ';'
+
+
+@lru_cache(maxsize=8)
+def _load_stylesheet(css_path: str, mtime: float) -> Stylesheet:
+    """Charge et compile une feuille de styles (une fois par version du fichier)."""
+    with open(css_path, 'r', encoding='utf-8') as f:
+        return Stylesheet(f.read())
+
+
+class NewsletterCSSInliner:
+    """
+    Inline les styles de static/email-styles.css dans les attributs style du HTML.
+
+    Les clients email ignorent la plupart des feuilles de styles : les templates
+    utilisent donc des classes, et cette étape les convertit en styles inline.
+    Les styles inline déjà présents dans le template sont conservés et restent
+    prioritaires.
+
+    L'inlining s'applique à du HTML rendu (inline) ou à la source d'un
+    template Jinja2 (inline_template, utilisé par CSSInliningLoader). Dans un
+    template, les balises Jinja2 peuvent apparaître partout, y compris dans
+    les attributs, sauf dans class et id : le style d'un élément doit être
+    connu au chargement du template.
+    """
+
+    def __init__(self, css_path: str = 'static/email-styles.css'):
+        """
+        Initialise l'inliner avec la feuille de styles à appliquer.
+
+        Args:
+            css_path: Chemin vers le fichier CSS
+        """
+        self.stylesheet = _load_stylesheet(
+            os.path.abspath(css_path), os.path.getmtime(css_path)
+        )
+
+    def inline(self, html_content: str) -> str:
+        """
+        Applique la feuille de styles au HTML.
+
+        Args:
+            html_content: HTML rendu contenant des classes
+
+        Returns:
+            Le HTML avec les styles inlinés
+        """
+        stylesheet = self.stylesheet
+        leftover_block = (
+            f"<style>\n{stylesheet.leftover_css}\n</style>\n" if stylesheet.leftover_css else ''
+        )
+        output = []
+        tags = []        # Balises ouvertes
+        nodes = [0]      # Nœuds de l'arbre des ancêtres (0 = racine)
+        rewritten = {}   # (nœud parent, balise, attributs) -> (nœud, balise réécrite)
+        position = 0
+        raw_text_end = None
+
+        for match in _TAG_RE.finditer(html_content):
+            closing, tag_name = match.group(1), match.group(2)
+            if tag_name is None:
+                continue
+            tag = tag_name.lower()
+            if raw_text_end is not None:
+                if closing and tag == raw_text_end:
+                    raw_text_end = None
+                continue
+
+            if closing:
+                if tag == 'head' and leftover_block:
+                    output.append(html_content[position:match.start()])
+                    output.append(leftover_block)
+                    position = match.start()
+                    leftover_block = ''
+                # Dépiler jusqu'à la balise correspondante (HTML tolérant)
+                for depth in range(len(tags) - 1, -1, -1):
+                    if tags[depth] == tag:
+                        del tags[depth:]
+                        del nodes[depth + 1:]
+                        break
+                continue
+
+            attributes = match.group(3)
+            key = (nodes[-1], tag_name, attributes)
+            cached = rewritten.get(key)
+            if cached is None:
+                element = self._signature(tag, attributes)
+                node = stylesheet.child_node(nodes[-1], element)
+                cached = (node, self._rewrite_tag(tag_name, attributes, element, node))
+                rewritten[key] = cached
+            node, replacement = cached
+
+            if replacement is not None:
+                output.append(html_content[position:match.start()])
+                output.append(replacement)
+                position = match.end()
+
+            if tag in RAW_TEXT_ELEMENTS:
+                raw_text_end = tag
+            elif tag not in VOID_ELEMENTS and not attributes.endswith('/'):
+                tags.append(tag)
+                nodes.append(node)
+
+        output.append(html_content[position:])
+        html_content = ''.join(output)
+
+        # Pas de <head> : les règles restantes sont placées en tête du document
+        if leftover_block:
+            html_content = leftover_block + html_content
+
+        return html_content
+
+    def inline_template(self, source: str, name: str = None) -> str:
+        """
+        Applique la feuille de styles à la source d'un template Jinja2.
+
+        Les balises Jinja2 sont remplacées par des marqueurs neutres pendant
+        l'inlining ('>' ou '<' dans une expression ne coupent donc pas une
+        balise HTML), puis restaurées telles quelles.
+
+        Args:
+            source: Source du template
+            name: Nom du template, pour les messages d'erreur
+
+        Returns:
+            La source avec les styles inlinés
+
+        Raises:
+            ValueError: Si un attribut class ou id contient une balise Jinja2
+        """
+        prefix = f"Template {name} : " if name else ''
+        if _JINJA_MARKER in source:
+            raise ValueError(f"{prefix}caractère NUL inattendu dans la source")
+
+        jinja_tags = []
+
+        def mask(match):
+            jinja_tags.append(match.group(0))
+            return f"{_JINJA_MARKER}{len(jinja_tags) - 1}{_JINJA_MARKER}"
+
+        masked = _JINJA_RE.sub(mask, source)
+        try:
+            inlined = self.inline(masked)
+        except ValueError as e:
+            raise ValueError(f"{prefix}{e}") from None
+        return _JINJA_PLACEHOLDER_RE.sub(lambda m: jinja_tags[int(m.group(1))], inlined)
+
+    def _rewrite_tag(self, tag_name: str, attributes: str, element: Element, node: int) -> Optional[str]:
+        """
+        Réécrit une balise ouvrante avec son style inliné.
+
+        Returns:
+            La balise réécrite, ou None si elle reste inchangée
+        """
+        stylesheet = self.stylesheet
+        style = stylesheet.style_of(node)
+        unused_classes = element[2] - stylesheet.leftover_classes
+        if not style and not unused_classes:
+            return None
+        if unused_classes:
+            attributes = self._prune_classes(attributes, stylesheet.leftover_classes)
+        if style:
+            attributes = self._apply_style(attributes, style)
+        return f"<{tag_name}{attributes}>"
+
+    @staticmethod
+    def _signature(tag: str, attributes: str) -> Element:
+        """Extrait (balise, id, classes) des attributs d'une balise ouvrante."""
+        element_id = None
+        classes = frozenset()
+        if 'class' in attributes or 'id' in attributes:
+            for name, double, single, bare in _ATTR_RE.findall(attributes):
+                name = name.lower()
+                value = double or single or bare
+                if name not in ('class', 'id'):
+                    continue
+                if _JINJA_MARKER in value:
+                    raise ValueError(
+                        f"balise Jinja2 dans l'attribut {name} de <{tag}> : "
+                        "le style doit pouvoir être calculé au chargement du template"
+                    )
+                if name == 'class':
+                    classes = frozenset(value.split())
+                else:
+                    element_id = value
+        return (tag, element_id, classes)
+
+    @staticmethod
+    def _prune_classes(attributes: str, kept: frozenset) -> str:
+        """
+        Retire les classes devenues inutiles une fois les styles inlinés.
+
+        Seules les classes référencées par les règles restées dans <style>
+        (media queries) sont conservées, pour ne pas alourdir le HTML envoyé.
+        """
+        existing = _CLASS_ATTR_RE.search(attributes)
+        if not existing:
+            return attributes
+        remaining = ' '.join(
+            name for name in existing.group(1).strip('"\'').split() if name in kept
+        )
+        replacement = f' class="{remaining}"' if remaining else ''
+        return attributes[:existing.start()] + replacement + attributes[existing.end():]
+
+    @staticmethod
+    def _apply_style(attributes: str, css: str) -> str:
+        """
+        Fusionne le style calculé avec l'attribut style existant de la balise.
+
+        Le style existant est placé après celui de la feuille de styles afin
+        qu'il reste prioritaire.
+        """
+        existing = _STYLE_ATTR_RE.search(attributes)
+        if existing:
+            current = existing.group(3) if existing.group(3) is not None else existing.group(4)
+            merged = f"{css} {current.strip()}" if current.strip() else css
+            return (
+                attributes[:existing.start()]
+                + f'{existing.group(1)}"{merged}"'
+                + attributes[existing.end():]
+            )
+        stripped = attributes.rstrip()
+        if stripped.endswith('/'):
+            return f'{stripped[:-1].rstrip()} style="{css}" /'
+        return f'{stripped} style="{css}"'
+
+
+class CSSInliningLoader(BaseLoader):
+    """
+    Loader Jinja2 qui inline la feuille de styles dans la source des templates.
+
+    Le style d'un élément ne dépend que de la structure du template, pas des
+    données : l'inlining est donc fait une seule fois au chargement du template,
+    et le rendu d'une édition ne coûte rien de plus qu'un template inliné à la main.
+    """
+
+    def __init__(self, loader: BaseLoader, inliner: NewsletterCSSInliner):
+        """
+        Args:
+            loader: Loader Jinja2 fournissant la source des templates
+            inliner: Inliner à appliquer sur chaque source
+        """
+        self.loader = loader
+        self.inliner = inliner
+
+    def get_source(self, environment, template):
+        """Retourne la source du template avec les styles inlinés (templates HTML uniquement)."""
+        source, filename, uptodate = self.loader.get_source(environment, template)
+        if template.endswith(('.html', '.htm')):
+            source = self.inliner.inline_template(source, template)
+        return source, filename, uptodate
+
+
+def benchmark_inliner(repetitions: int = 50, runs: int = 20):
+    """
+    Mesure le coût de l'inlining sur une grande édition.
+
+    Compare le template à classes inliné au chargement avec l'ancien template
+    inliné à la main (examples/newsletter_hand_inlined.html) et avec le même
+    template sans inlining (taille et temps de rendu), et indique le coût
+    ponctuel de l'inlining de la source.
+    """
+    import time
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+    from excel_parser import NewsletterExcelParser
+    from html_generator import NewsletterHTMLGenerator
+
+    resources = NewsletterExcelParser('examples/exemple.xlsx').parse() * repetitions
+    generator = NewsletterHTMLGenerator()
+    ordered = generator._order_resources(resources)
+    raw_template = Environment(
+        loader=FileSystemLoader(generator.template_dir),
+        autoescape=select_autoescape(['html', 'xml'])
+    ).get_template('newsletter.html')
+    hand_inlined_template = Environment(
+        loader=FileSystemLoader('examples'),
+        autoescape=select_autoescape(['html', 'xml'])
+    ).get_template('newsletter_hand_inlined.html')
+
+    def measure(function):
+        function()  # Préchauffage
+        start = time.perf_counter()
+        for _ in range(runs):
+            result = function()
+        return (time.perf_counter() - start) / runs * 1000, result
+
+    with open(os.path.join(generator.template_dir, 'newsletter.html'), 'r', encoding='utf-8') as f:
+        source = f.read()
+    source_ms, _ = measure(lambda: generator.inliner.inline_template(source))
+    raw_ms, raw_html = measure(
+        lambda: raw_template.render(resources=ordered, date="Janvier 2025", generation_date="")
+    )
+    inlined_ms, inlined_html = measure(
+        lambda: generator.template.render(resources=ordered, date="Janvier 2025", generation_date="")
+    )
+    hand_ms, hand_html = measure(
+        lambda: hand_inlined_template.render(resources=ordered, date="Janvier 2025", generation_date="")
+    )
+
+    print(f"\n⏱️  Benchmark de l'inliner CSS ({len(resources)} ressources, {runs} passes)")
+    print(f"  Inlining du template (une fois par chargement) : {source_ms:.2f} ms")
+    print(f"  Rendu sans inlining : {raw_ms:.2f} ms ({len(raw_html.encode('utf-8')) / 1024:.1f} Ko)")
+    print(f"  Rendu avec inlining : {inlined_ms:.2f} ms ({len(inlined_html.encode('utf-8')) / 1024:.1f} Ko)")
+    print(f"  Ancien template inliné à la main : {hand_ms:.2f} ms ({len(hand_html.encode('utf-8')) / 1024:.1f} Ko)")
+
+
+if __name__ == '__main__':
+    benchmark_inliner()
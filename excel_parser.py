@@ -1,8 +1,25 @@
 """
 Module pour lire et parser les fichiers Excel contenant les ressources newsletter
 """
+from difflib import get_close_matches
+import re
+
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+
+class NewsletterValidationError(ValueError):
+    """
+    Erreur levée quand le fichier Excel (ou les ressources JSON) ne respecte
+    pas la structure attendue.
+
+    L'attribut `errors` contient le détail de chaque problème, sous la forme
+    {'row_number', 'column', 'value', 'message'} (row_number 1 = ligne d'en-tête).
+    """
+
+    def __init__(self, message: str, errors: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.errors = errors
 
 
 class NewsletterExcelParser:
@@ -33,6 +50,36 @@ class NewsletterExcelParser:
         'événements'
     ]
 
+    # Champs produits pour chaque type : clé -> (colonne Excel, valeur par défaut)
+    INTRODUCTION_FIELDS = {
+        'description': ('description de la ressource', '')
+    }
+    EVENT_FIELDS = {
+        'titre': ('titre de la ressource', ''),
+        'lien': ('lien', ''),
+        'date': ('date', ''),
+        'horaire': ('horaire', ''),
+        'localite': ('localité', ''),
+        'prix': ('prix', 'Gratuit'),
+        'langue': ('langue', 'Français')
+    }
+    STANDARD_FIELDS = {
+        'image': ('image', ''),
+        'titre': ('titre de la ressource', ''),
+        'description': ('description de la ressource', ''),
+        'lien': ('lien', '')
+    }
+
+    # Colonnes obligatoires dans la ligne d'en-tête
+    REQUIRED_COLUMNS = ['type de ressource']
+
+    # Similarité à partir de laquelle une colonne inconnue est une faute de frappe
+    TYPO_CUTOFF = 0.8
+
+    # Colonnes contenant des URLs
+    URL_COLUMNS = ['image', 'lien']
+    URL_PATTERN = r'^(?:https?://|mailto:)\S+$'
+
     def __init__(self, excel_file_path: str):
         """
         Initialise le parser avec le chemin du fichier Excel.
@@ -42,6 +89,7 @@ class NewsletterExcelParser:
         """
         self.excel_file_path = excel_file_path
         self.data = None
+        self.warnings = []  # Problèmes non bloquants relevés par validate()
 
     def parse(self) -> List[Dict[str, Any]]:
         """
@@ -50,14 +98,9 @@ class NewsletterExcelParser:
         Returns:
             Liste de dictionnaires contenant les données de chaque ressource
         """
-        # Lire le fichier Excel
-        try:
-            self.data = pd.read_excel(self.excel_file_path)
-        except Exception as e:
-            raise ValueError(f"Erreur lors de la lecture du fichier Excel : {str(e)}")
-
-        # Normaliser les noms de colonnes (enlever espaces, minuscules)
-        self.data.columns = self.data.columns.str.strip().str.lower()
+        # Valider puis lire le fichier Excel
+        if self.data is None:
+            self.validate()
 
         # Convertir en liste de dictionnaires
         resources = []
@@ -68,6 +111,214 @@ class NewsletterExcelParser:
 
         return resources
 
+    def validate(self) -> None:
+        """
+        Valide la structure du fichier Excel avant de le parser.
+
+        L'en-tête est vérifié en premier, sans charger le reste de la feuille :
+        un fichier dont les colonnes sont incorrectes est rejeté immédiatement.
+        Les types de ressources et les URLs sont ensuite vérifiés colonne par
+        colonne sur l'ensemble des lignes.
+
+        Les colonnes inconnues qui ne ressemblent à aucune colonne attendue
+        (ex: une colonne « Notes ») ne bloquent pas : elles sont ignorées et
+        signalées dans self.warnings.
+
+        Raises:
+            NewsletterValidationError: Si le fichier contient des erreurs
+            ValueError: Si le fichier ne peut pas être lu
+        """
+        columns = self._normalize_columns(self._read_excel(nrows=0).columns)
+        errors, self.warnings = self._validate_header(columns)
+        if errors:
+            raise NewsletterValidationError("Les colonnes du fichier Excel sont incorrectes", errors)
+
+        self.data = self._read_excel()
+        self.data.columns = self._normalize_columns(self.data.columns)
+
+        errors = self._validate_body(self.data)
+        if errors:
+            raise NewsletterValidationError(
+                f"Le fichier Excel contient {len(errors)} erreur(s)", errors
+            )
+
+    def _read_excel(self, nrows: int = None) -> pd.DataFrame:
+        """Lit le fichier Excel (seulement l'en-tête si nrows=0)."""
+        try:
+            return pd.read_excel(self.excel_file_path, nrows=nrows)
+        except Exception as e:
+            raise ValueError(f"Erreur lors de la lecture du fichier Excel : {str(e)}")
+
+    @staticmethod
+    def _normalize_columns(columns: pd.Index) -> pd.Index:
+        """Normalise les noms de colonnes (enlever espaces, minuscules)."""
+        return columns.astype(str).str.strip().str.lower()
+
+    @classmethod
+    def _validate_header(cls, columns: pd.Index) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Vérifie la ligne d'en-tête : colonnes obligatoires, inconnues ou en double.
+
+        Une colonne inconnue proche d'une colonne attendue est une faute de
+        frappe (erreur) ; les autres sont de simples avertissements. Les
+        colonnes sans nom (cellules d'en-tête vides) sont ignorées.
+
+        Returns:
+            (erreurs, avertissements)
+        """
+        known_columns = set(cls.REQUIRED_COLUMNS)
+        for fields in (cls.INTRODUCTION_FIELDS, cls.EVENT_FIELDS, cls.STANDARD_FIELDS):
+            known_columns.update(column_name for column_name, _ in fields.values())
+
+        errors = []
+        warnings = []
+        for column_name in cls.REQUIRED_COLUMNS:
+            if column_name not in columns:
+                errors.append({
+                    'row_number': 1,
+                    'column': column_name,
+                    'value': '',
+                    'message': f"Colonne obligatoire manquante : « {column_name} »"
+                })
+        for column_name in columns[columns.duplicated()].unique():
+            errors.append({
+                'row_number': 1,
+                'column': column_name,
+                'value': column_name,
+                'message': f"Colonne en double : « {column_name} »"
+            })
+        for column_name in columns.unique():
+            if column_name in known_columns or column_name.startswith('unnamed:'):
+                continue
+            close_matches = get_close_matches(column_name, known_columns, n=1, cutoff=cls.TYPO_CUTOFF)
+            if close_matches:
+                errors.append({
+                    'row_number': 1,
+                    'column': column_name,
+                    'value': column_name,
+                    'message': f"Colonne inconnue : « {column_name} » (vouliez-vous dire « {close_matches[0]} » ?)"
+                })
+            else:
+                warnings.append({
+                    'row_number': 1,
+                    'column': column_name,
+                    'value': column_name,
+                    'message': f"Colonne inconnue ignorée : « {column_name} »"
+                })
+        return errors, warnings
+
+    @classmethod
+    def _validate_body(cls, data: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Vérifie les types de ressources et les URLs de toutes les lignes.
+
+        Les vérifications sont vectorisées (une opération par colonne). Les
+        lignes sans type de ressource sont ignorées, comme dans parse().
+        """
+        errors = []
+        types = data['type de ressource']
+        types = types[types.notna()].astype(str).str.strip().str.lower()
+        types = types[types != '']
+
+        unknown_types = types[~types.isin(cls.RESOURCE_TYPES)]
+        for index, value in unknown_types.items():
+            errors.append(cls._type_error(index + 2, value))
+
+        for column_name in cls.URL_COLUMNS:
+            if column_name not in data.columns:
+                continue
+            urls = data.loc[types.index, column_name]
+            urls = urls[urls.notna()].astype(str).str.strip()
+            invalid_urls = urls[(urls != '') & ~urls.str.match(cls.URL_PATTERN)]
+            for index, value in invalid_urls.items():
+                errors.append(cls._url_error(index + 2, column_name, value))
+
+        errors.sort(key=lambda error: error['row_number'])
+        return errors
+
+    @classmethod
+    def _type_error(cls, row_number: int, value: str) -> Dict[str, Any]:
+        """Construit l'erreur d'un type de ressource inconnu."""
+        return {
+            'row_number': row_number,
+            'column': 'type de ressource',
+            'value': value,
+            'message': (
+                f"Type de ressource inconnu : « {value} » "
+                f"(attendu : {', '.join(cls.RESOURCE_TYPES)})"
+            )
+        }
+
+    @staticmethod
+    def _url_error(row_number: int, column_name: str, value: str) -> Dict[str, Any]:
+        """Construit l'erreur d'une URL invalide."""
+        return {
+            'row_number': row_number,
+            'column': column_name,
+            'value': value,
+            'message': f"URL invalide : « {value} » (doit commencer par http://, https:// ou mailto:)"
+        }
+
+    @classmethod
+    def parse_records(cls, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Normalise des ressources déjà structurées (ex: JSON de l'aperçu en direct).
+
+        Produit la même structure que parse(), sans passer par un fichier Excel,
+        avec les mêmes vérifications des types de ressources et des URLs.
+
+        Args:
+            records: Liste de dictionnaires au format retourné par parse()
+
+        Returns:
+            Liste de dictionnaires contenant les données de chaque ressource
+
+        Raises:
+            NewsletterValidationError: Si des ressources sont invalides
+            ValueError: Si une ressource n'est pas un objet
+        """
+        resources = []
+        errors = []
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                raise ValueError(f"Ressource n°{index + 1} invalide : un objet est attendu")
+
+            resource_type = str(record.get('type') or '').strip().lower()
+            if not resource_type:
+                continue
+
+            row_number = record.get('row_number', index + 2)
+            if resource_type not in cls.RESOURCE_TYPES:
+                errors.append(cls._type_error(row_number, resource_type))
+                continue
+
+            resource = {'type': resource_type, 'row_number': row_number}
+            for key, (_, default) in cls._fields_for(resource_type).items():
+                value = record.get(key)
+                resource[key] = default if value is None else str(value).strip()
+            for column_name in cls.URL_COLUMNS:
+                value = resource.get(column_name)
+                if value and not re.match(cls.URL_PATTERN, value):
+                    errors.append(cls._url_error(row_number, column_name, value))
+            resources.append(resource)
+
+        if errors:
+            raise NewsletterValidationError(
+                f"Les ressources contiennent {len(errors)} erreur(s)", errors
+            )
+        return resources
+
+    @classmethod
+    def _fields_for(cls, resource_type: str) -> Dict[str, tuple]:
+        """Retourne les champs attendus pour un type de ressource."""
+        if resource_type == 'introduction':
+            return cls.INTRODUCTION_FIELDS
+        if resource_type == 'événements':
+            return cls.EVENT_FIELDS
+        if resource_type in ('ressource en vedette', 'ressources', 'vidéothèque'):
+            return cls.STANDARD_FIELDS
+        raise ValueError(f"Type de ressource inconnu : « {resource_type} »")
+
     def _parse_row(self, row: pd.Series, index: int) -> Dict[str, Any]:
         """
         Parse une ligne du fichier Excel.
@@ -96,43 +347,11 @@ class NewsletterExcelParser:
         }
 
         # Parser selon le type de ressource
-        if resource_type == 'introduction':
-            resource.update(self._parse_introduction(row))
-        elif resource_type == 'événements':
-            resource.update(self._parse_event(row))
-        else:
-            # ressource en vedette, ressources, vidéothèque
-            resource.update(self._parse_standard_resource(row))
+        for key, (column_name, default) in self._fields_for(resource_type).items():
+            resource[key] = self._get_value(row, column_name, default=default)
 
         return resource
 
-    def _parse_introduction(self, row: pd.Series) -> Dict[str, Any]:
-        """Parse une ressource de type 'introduction'."""
-        return {
-            'description': self._get_value(row, 'description de la ressource', default='')
-        }
-
-    def _parse_event(self, row: pd.Series) -> Dict[str, Any]:
-        """Parse une ressource de type 'événements'."""
-        return {
-            'titre': self._get_value(row, 'titre de la ressource', default=''),
-            'lien': self._get_value(row, 'lien', default=''),
-            'date': self._get_value(row, 'date', default=''),
-            'horaire': self._get_value(row, 'horaire', default=''),
-            'localite': self._get_value(row, 'localité', default=''),
-            'prix': self._get_value(row, 'prix', default='Gratuit'),
-            'langue': self._get_value(row, 'langue', default='Français')
-        }
-
-    def _parse_standard_resource(self, row: pd.Series) -> Dict[str, Any]:
-        """Parse une ressource standard (vedette, ressources, vidéothèque)."""
-        return {
-            'image': self._get_value(row, 'image', default=''),
-            'titre': self._get_value(row, 'titre de la ressource', default=''),
-            'description': self._get_value(row, 'description de la ressource', default=''),
-            'lien': self._get_value(row, 'lien', default='')
-        }
-
     def _get_value(self, row: pd.Series, column_name: str, default: str = '') -> str:
         """
         Récupère une valeur d'une colonne en gérant les erreurs et les valeurs nulles.
@@ -5,6 +5,9 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 from datetime import datetime
 from typing import List, Dict, Any
 import os
+import re
+
+from css_inliner import NewsletterCSSInliner, CSSInliningLoader
 
 
 class NewsletterHTMLGenerator:
@@ -12,26 +15,46 @@ class NewsletterHTMLGenerator:
     Génère le HTML d'une newsletter à partir de ressources structurées.
 
     Utilise Jinja2 pour le templating et produit un HTML compatible avec
-    les clients email (Mailchimp, etc.)
+    les clients email (Mailchimp, etc.). Les classes du template sont
+    converties en styles inline à partir de static/email-styles.css au
+    chargement du template.
     """
 
-    def __init__(self, template_dir: str = 'templates'):
+    # Block Jinja2 du template correspondant à chaque section de la newsletter
+    SECTION_BLOCKS = {
+        'introduction': 'introduction',
+        'ressource en vedette': 'vedette',
+        'ressources': 'ressources',
+        'vidéothèque': 'videotheque',
+        'événements': 'evenements'
+    }
+
+    def __init__(self, template_dir: str = 'templates', css_path: str = 'static/email-styles.css'):
         """
         Initialise le générateur avec le répertoire des templates.
 
         Args:
             template_dir: Chemin vers le dossier contenant les templates
+            css_path: Chemin vers la feuille de styles à inliner
         """
         self.template_dir = template_dir
+        self.css_path = css_path
+
+        # Versions des fichiers sources chargés (relevées avant leur lecture)
+        self.sources_mtime = self.current_sources_mtime()
 
-        # Configuration de Jinja2
+        # Inliner CSS (la feuille de styles est compilée une fois par processus)
+        self.inliner = NewsletterCSSInliner(css_path)
+
+        # Configuration de Jinja2 : les styles sont inlinés au chargement du template
         self.env = Environment(
-            loader=FileSystemLoader(template_dir),
+            loader=CSSInliningLoader(FileSystemLoader(template_dir), self.inliner),
             autoescape=select_autoescape(['html', 'xml'])
         )
 
-        # Charger le template principal
+        # Charger le template principal et sa version texte
         self.template = self.env.get_template('newsletter.html')
+        self.text_template = self.env.get_template('newsletter.txt')
 
     def generate(
         self,
@@ -71,6 +94,74 @@ class NewsletterHTMLGenerator:
 
         return html_content
 
+    def generate_text(
+        self,
+        resources: List[Dict[str, Any]],
+        newsletter_date: str = None,
+        output_path: str = None
+    ) -> str:
+        """
+        Génère la version texte de la newsletter (envoyée avec le HTML aux ESP).
+
+        Args:
+            resources: Liste des ressources parsées depuis Excel
+            newsletter_date: Date de la newsletter (format texte)
+            output_path: Chemin où sauvegarder le texte (optionnel)
+
+        Returns:
+            Le texte brut généré
+        """
+        if newsletter_date is None:
+            newsletter_date = datetime.now().strftime("%B %Y")
+
+        text_content = self.text_template.render(
+            resources=self._order_resources(resources),
+            date=newsletter_date
+        )
+
+        # Nettoyer les lignes laissées vides par les balises Jinja2
+        text_content = re.sub(r'[ \t]+\n', '\n', text_content)
+        text_content = re.sub(r'\n{3,}', '\n\n', text_content).strip() + '\n'
+
+        if output_path:
+            self._save_html(text_content, output_path)
+
+        return text_content
+
+    def render_section(
+        self,
+        resources: List[Dict[str, Any]],
+        section: str,
+        newsletter_date: str = None
+    ) -> str:
+        """
+        Génère uniquement le HTML d'une section de la newsletter.
+
+        Utilisé par l'aperçu en direct : seule la section modifiée est
+        re-rendue, puis remplacée entre ses marqueurs <!-- section:... -->.
+
+        Args:
+            resources: Liste des ressources (toutes sections confondues)
+            section: Type de ressource de la section (ex: 'ressources')
+            newsletter_date: Date de la newsletter (format texte)
+
+        Returns:
+            Le fragment HTML de la section, marqueurs inclus
+        """
+        if section not in self.SECTION_BLOCKS:
+            raise ValueError(f"Section inconnue : {section}")
+
+        if newsletter_date is None:
+            newsletter_date = datetime.now().strftime("%B %Y")
+
+        context = self.template.new_context({
+            'resources': self._order_resources(resources),
+            'date': newsletter_date,
+            'generation_date': datetime.now().strftime("%d/%m/%Y à %H:%M")
+        })
+        block = self.template.blocks[self.SECTION_BLOCKS[section]]
+        return ''.join(block(context))
+
     def _order_resources(self, resources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Ordonne les ressources selon l'ordre logique de la newsletter.
@@ -97,6 +188,19 @@ class NewsletterHTMLGenerator:
 
         return sorted(resources, key=get_order)
 
+    def current_sources_mtime(self) -> tuple:
+        """
+        Retourne les dates de modification de la feuille de styles et des templates.
+
+        Un générateur conservé entre les requêtes est périmé dès que cette
+        valeur diffère de self.sources_mtime.
+        """
+        return (
+            os.path.getmtime(self.css_path),
+            os.path.getmtime(os.path.join(self.template_dir, 'newsletter.html')),
+            os.path.getmtime(os.path.join(self.template_dir, 'newsletter.txt'))
+        )
+
     def _save_html(self, html_content: str, output_path: str) -> None:
         """
         Sauvegarde le contenu HTML dans un fichier.
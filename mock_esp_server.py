@@ -0,0 +1,155 @@
+"""
+Serveur ESP (Email Service Provider) factice pour tester la publication en local
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+import json
+import os
+import threading
+import uuid
+
+
+class MockESPServer(ThreadingHTTPServer):
+    """
+    Imite l'API de campagnes attendue par CampaignPublisher.
+
+    - POST /campaigns : crée une campagne {name, subject, html, text}
+      (201), ou retourne la campagne existante pour une Idempotency-Key
+      déjà reçue (200)
+    - GET /campaigns : liste les campagnes créées
+
+    `fail_next` permet de simuler des erreurs 503 pour tester les retries.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], api_key: str = 'mock-key', fail_next: int = 0):
+        """
+        Args:
+            address: (hôte, port) d'écoute ; port 0 pour un port libre
+            api_key: Clé attendue dans l'en-tête Authorization
+            fail_next: Nombre de prochaines requêtes POST à rejeter en 503
+        """
+        super().__init__(address, MockESPRequestHandler)
+        self.api_key = api_key
+        self.fail_next = fail_next
+        self.campaigns = {}        # Idempotency-Key -> campagne
+        self.request_count = 0     # Requêtes POST reçues (retries compris)
+        self.connection_count = 0  # Connexions TCP ouvertes par les clients
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """URL de base de l'API."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def process_request(self, request, client_address):
+        """Compte les connexions pour vérifier la réutilisation (keep-alive)."""
+        with self.lock:
+            self.connection_count += 1
+        super().process_request(request, client_address)
+
+
+class MockESPRequestHandler(BaseHTTPRequestHandler):
+    """Gestionnaire des requêtes du serveur ESP factice."""
+
+    # HTTP/1.1 pour garder les connexions ouvertes entre les requêtes
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        """Liste les campagnes créées."""
+        if not self._check_auth():
+            return
+        if self.path != '/campaigns':
+            return self._send_json(404, {'error': 'Not found'})
+        with self.server.lock:
+            campaigns = list(self.server.campaigns.values())
+        self._send_json(200, {'campaigns': campaigns})
+
+    def do_POST(self):
+        """Crée une campagne (idempotent grâce à l'en-tête Idempotency-Key)."""
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+
+        if not self._check_auth():
+            return
+        if self.path != '/campaigns':
+            return self._send_json(404, {'error': 'Not found'})
+
+        with self.server.lock:
+            self.server.request_count += 1
+            if self.server.fail_next > 0:
+                self.server.fail_next -= 1
+                return self._send_json(503, {'error': 'Service temporairement indisponible'})
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return self._send_json(400, {'error': 'JSON invalide'})
+
+        missing = [key for key in ('subject', 'html') if not payload.get(key)]
+        if missing:
+            return self._send_json(400, {'error': f"Champs manquants : {', '.join(missing)}"})
+
+        idempotency_key = self.headers.get('Idempotency-Key') or uuid.uuid4().hex
+        with self.server.lock:
+            campaign = self.server.campaigns.get(idempotency_key)
+            if campaign is not None:
+                return self._send_json(200, campaign)
+            campaign = {
+                'id': uuid.uuid4().hex[:12],
+                'name': payload.get('name', ''),
+                'subject': payload['subject'],
+                'html_size': len(payload['html']),
+                'text_size': len(payload.get('text') or ''),
+                'status': 'draft'
+            }
+            self.server.campaigns[idempotency_key] = campaign
+        self._send_json(201, campaign)
+
+    def _check_auth(self) -> bool:
+        """Vérifie l'en-tête Authorization: Bearer <clé>."""
+        if self.headers.get('Authorization') == f"Bearer {self.server.api_key}":
+            return True
+        self._send_json(401, {'error': 'Clé API invalide'})
+        return False
+
+    def _send_json(self, status: int, data: dict) -> None:
+        """Envoie une réponse JSON avec Content-Length (requis pour le keep-alive)."""
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Journalisation désactivée (le serveur est utilisé dans les tests)."""
+
+
+def start_mock_server(port: int = 0, api_key: str = 'mock-key', fail_next: int = 0) -> MockESPServer:
+    """
+    Démarre le serveur factice dans un thread en arrière-plan.
+
+    Args:
+        port: Port d'écoute (0 pour un port libre)
+        api_key: Clé attendue dans l'en-tête Authorization
+        fail_next: Nombre de prochaines requêtes POST à rejeter en 503
+
+    Returns:
+        Le serveur démarré (appeler shutdown() pour l'arrêter)
+    """
+    server = MockESPServer(('127.0.0.1', port), api_key=api_key, fail_next=fail_next)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get('MOCK_ESP_PORT', 5002))
+    server = MockESPServer(('127.0.0.1', port), api_key=os.environ.get('ESP_API_KEY', 'mock-key'))
+
+    print(f"\n📮 Serveur ESP factice sur {server.url}")
+    print(f"💡 Configurez ESP_API_URL={server.url} et ESP_API_KEY={server.api_key}\n")
+
+    server.serve_forever()